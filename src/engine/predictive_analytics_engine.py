@@ -112,7 +112,7 @@ class PredictiveAnalyticsEngine:
             "prediction_horizon_days": 90,
             "min_data_points_prediction": 5
         }
-        
+
         self._initialize_models()
         logger.info("🔮 Predictive Analytics Engine Ultra-Avançado inicializado")
 
@@ -160,23 +160,40 @@ class PredictiveAnalyticsEngine:
             "esses", "pelas", "este", "fosse", "dele", "tu", "te", "vocês", "vos", "lhes", "meus", "minhas"
         ]
 
-    async def analyze_session_data(self, session_id: str) -> Dict[str, Any]:
+    def _load_massive_data(self, session_dir: Path) -> Optional[Dict[str, Any]]:
+        """Lê os dados massivos da sessão do disco"""
+        massive_data_path = session_dir / "massive_data_collected.json"
+        if not massive_data_path.exists():
+            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+            return None
+
+        with open(massive_data_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def analyze_session_data(self, session_id: str, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analisa todos os dados disponíveis de uma sessão para gerar insights preditivos ultra-avançados
-        
+
         Args:
             session_id: ID da sessão
-            
+            massive_data: Dados massivos já em memória (evita reler o JSON do disco)
+
         Returns:
             Dict com insights preditivos completos
         """
         logger.info(f"🔮 INICIANDO ANÁLISE PREDITIVA ULTRA-AVANÇADA para sessão: {session_id}")
-        
+
         session_dir = Path(f"analyses_data/{session_id}")
         if not session_dir.exists():
             logger.error(f"❌ Diretório da sessão não encontrado: {session_dir}")
             return {"success": False, "error": "Diretório da sessão não encontrado"}
 
+        # Carrega os dados massivos uma única vez e passa às fases como
+        # argumento: o engine é um singleton compartilhado entre sessões
+        # concorrentes, então eles não podem viver em estado de instância
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+
         # Estrutura de insights ultra-completa
         insights = {
             "session_id": session_id,
@@ -211,11 +228,11 @@ class PredictiveAnalyticsEngine:
         try:
             # FASE 1: Análise Textual Ultra-Profunda
             logger.info("🧠 FASE 1: Análise textual ultra-profunda...")
-            insights["textual_insights"] = await self._perform_ultra_textual_analysis(session_dir)
+            insights["textual_insights"] = await self._perform_ultra_textual_analysis(session_dir, massive_data)
             
             # FASE 2: Análise de Tendências Temporais
             logger.info("📈 FASE 2: Análise de tendências temporais...")
-            insights["temporal_trends"] = await self._perform_temporal_analysis(session_dir)
+            insights["temporal_trends"] = await self._perform_temporal_analysis(session_dir, massive_data)
             
             # FASE 3: Análise Visual Avançada (OCR + Computer Vision)
             logger.info("👁️ FASE 3: Análise visual avançada...")
@@ -223,19 +240,19 @@ class PredictiveAnalyticsEngine:
             
             # FASE 4: Análise de Rede e Conectividade
             logger.info("🕸️ FASE 4: Análise de rede e conectividade...")
-            insights["network_analysis"] = await self._perform_network_analysis(session_dir)
+            insights["network_analysis"] = await self._perform_network_analysis(session_dir, massive_data)
             
             # FASE 5: Dinâmica de Sentimentos
             logger.info("💭 FASE 5: Análise de dinâmica de sentimentos...")
-            insights["sentiment_dynamics"] = await self._analyze_sentiment_dynamics(session_dir)
+            insights["sentiment_dynamics"] = await self._analyze_sentiment_dynamics(session_dir, massive_data)
             
             # FASE 6: Evolução de Tópicos
             logger.info("🔄 FASE 6: Análise de evolução de tópicos...")
-            insights["topic_evolution"] = await self._analyze_topic_evolution(session_dir)
+            insights["topic_evolution"] = await self._analyze_topic_evolution(session_dir, massive_data)
             
             # FASE 7: Padrões de Engajamento
             logger.info("📊 FASE 7: Análise de padrões de engajamento...")
-            insights["engagement_patterns"] = await self._analyze_engagement_patterns(session_dir)
+            insights["engagement_patterns"] = await self._analyze_engagement_patterns(session_dir, massive_data)
             
             # FASE 8: Geração de Previsões Ultra-Avançadas
             logger.info("🔮 FASE 8: Geração de previsões ultra-avançadas...")
@@ -259,7 +276,7 @@ class PredictiveAnalyticsEngine:
             
             # FASE 13: Avaliação de Qualidade dos Dados
             logger.info("🔍 FASE 13: Avaliação de qualidade dos dados...")
-            insights["data_quality_assessment"] = await self._assess_data_quality(session_dir)
+            insights["data_quality_assessment"] = await self._assess_data_quality(session_dir, massive_data)
             
             # FASE 14: Recomendações Estratégicas
             logger.info("💡 FASE 14: Geração de recomendações estratégicas...")
@@ -334,6 +351,31 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise de chunk de conteúdo concluída.")
         return results
 
+    async def analyze_sentiment_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, float]]:
+        """Pontua sentimento texto a texto, preservando a granularidade por post.
+
+        Ao contrário de concatenar tudo em uma string gigante, o lote mantém
+        um score por texto (permitindo agregação por plataforma) e o pico de
+        memória fica limitado ao tamanho do lote. VADER é CPU puro, então os
+        lotes rodam no executor para não bloquear o event loop.
+        """
+        if not texts:
+            return []
+        if not (HAS_VADER and self.sentiment_analyzer):
+            logger.warning("⚠️ VADER não disponível para análise de sentimento em lote")
+            return [{} for _ in texts]
+
+        loop = asyncio.get_running_loop()
+
+        def _score_batch(batch: List[str]) -> List[Dict[str, float]]:
+            return [self.sentiment_analyzer.polarity_scores(text) for text in batch]
+
+        scores: List[Dict[str, float]] = []
+        for i in range(0, len(texts), batch_size):
+            scores.extend(await loop.run_in_executor(None, _score_batch, texts[i:i + batch_size]))
+
+        return scores
+
     async def analyze_data_quality(self, massive_data: Dict[str, Any]) -> Dict[str, Any]:
         """Avalia a qualidade dos dados coletados."""
         logger.info("🔍 Avaliando qualidade dos dados...")
@@ -456,7 +498,7 @@ class PredictiveAnalyticsEngine:
         logger.info(f"✅ Queries refinadas: {refined_queries}")
         return refined_queries
 
-    async def _perform_ultra_textual_analysis(self, session_dir: Path) -> Dict[str, Any]:
+    async def _perform_ultra_textual_analysis(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Realiza análise textual ultra-profunda em todo o conteúdo coletado."""
         logger.info("📝 Realizando análise textual ultra-profunda...")
         textual_insights = {
@@ -470,14 +512,11 @@ class PredictiveAnalyticsEngine:
             "content_summaries": {}
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return textual_insights
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         all_text_content = []
         for item in massive_data.get("extracted_content", []):
             text = str(item.get("content", "")) + str(item.get("snippet", "")) + str(item.get("title", ""))
@@ -558,7 +597,7 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise textual ultra-profunda concluída.")
         return textual_insights
 
-    async def _perform_temporal_analysis(self, session_dir: Path) -> Dict[str, Any]:
+    async def _perform_temporal_analysis(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Realiza análise de tendências temporais."""
         logger.info("⏰ Realizando análise de tendências temporais...")
         temporal_trends = {
@@ -569,14 +608,11 @@ class PredictiveAnalyticsEngine:
             "future_projections": {}
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return temporal_trends
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         # Coleta dados com timestamp
         dated_content = []
         for item in massive_data.get("extracted_content", []):
@@ -717,7 +753,7 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise visual avançada concluída.")
         return visual_insights
 
-    async def _perform_network_analysis(self, session_dir: Path) -> Dict[str, Any]:
+    async def _perform_network_analysis(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Realiza análise de rede e conectividade (ex: links entre fontes)."""
         logger.info("🔗 Realizando análise de rede e conectividade...")
         network_analysis = {
@@ -728,14 +764,11 @@ class PredictiveAnalyticsEngine:
             "influencer_detection": []
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return network_analysis
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         if not HAS_NETWORKX:
             logger.warning("⚠️ NetworkX não disponível para análise de rede.")
             return network_analysis
@@ -785,7 +818,7 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise de rede e conectividade concluída.")
         return network_analysis
 
-    async def _analyze_sentiment_dynamics(self, session_dir: Path) -> Dict[str, Any]:
+    async def _analyze_sentiment_dynamics(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa a dinâmica de sentimentos ao longo do tempo e por tópico."""
         logger.info("📈 Analisando dinâmica de sentimentos...")
         sentiment_dynamics = {
@@ -795,14 +828,11 @@ class PredictiveAnalyticsEngine:
             "sentiment_shifts": []
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return sentiment_dynamics
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         if not HAS_VADER or not self.sentiment_analyzer:
             logger.warning("⚠️ VADER Sentiment Analyzer não disponível.")
             return sentiment_dynamics
@@ -889,7 +919,7 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise de dinâmica de sentimentos concluída.")
         return sentiment_dynamics
 
-    async def _analyze_topic_evolution(self, session_dir: Path) -> Dict[str, Any]:
+    async def _analyze_topic_evolution(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa a evolução dos tópicos ao longo do tempo."""
         logger.info("🔄 Analisando evolução de tópicos...")
         topic_evolution = {
@@ -899,14 +929,11 @@ class PredictiveAnalyticsEngine:
             "declining_topics": []
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return topic_evolution
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         all_text_content = []
         dated_content = []
         for item in massive_data.get("extracted_content", []):
@@ -1003,7 +1030,7 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Análise de evolução de tópicos concluída.")
         return topic_evolution
 
-    async def _analyze_engagement_patterns(self, session_dir: Path) -> Dict[str, Any]:
+    async def _analyze_engagement_patterns(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analisa padrões de engajamento em redes sociais e outras fontes."""
         logger.info("📊 Analisando padrões de engajamento...")
         engagement_patterns = {
@@ -1013,14 +1040,11 @@ class PredictiveAnalyticsEngine:
             "engagement_prediction": {}
         }
 
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return engagement_patterns
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-
         social_data = massive_data.get("social_media_data", {}).get("all_platforms_data", {}).get("platforms", {})
         
         all_engagements = []
@@ -1250,7 +1274,7 @@ class PredictiveAnalyticsEngine:
         
         top_engaging_content = insights.get("engagement_patterns", {}).get("top_engaging_content", [])
         if top_engaging_content:
-            opportunity_mapping["marketing_campaigns"].append({"description": f"Analisar e replicar o sucesso do conteúdo de maior engajamento: {top_engaging_content[0].get("title", "")}", "relevance": "Alta"})
+            opportunity_mapping["marketing_campaigns"].append({"description": f"Analisar e replicar o sucesso do conteúdo de maior engajamento: {top_engaging_content[0].get('title', '')}", "relevance": "Alta"})
 
         # Oportunidades de Estratégia de Conteúdo
         top_keywords = insights.get("textual_insights", {}).get("top_keywords", [])
@@ -1311,17 +1335,14 @@ class PredictiveAnalyticsEngine:
         logger.info("✅ Métricas de confiança calculadas.")
         return confidence_metrics
 
-    async def _assess_data_quality(self, session_dir: Path) -> Dict[str, Any]:
+    async def _assess_data_quality(self, session_dir: Path, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Avalia a qualidade dos dados brutos coletados (chamada interna)."""
         logger.info("🔍 Avaliando qualidade dos dados brutos...")
-        massive_data_path = session_dir / "massive_data_collected.json"
-        if not massive_data_path.exists():
-            logger.warning(f"⚠️ massive_data_collected.json não encontrado em {session_dir}")
+        if massive_data is None:
+            massive_data = self._load_massive_data(session_dir)
+        if massive_data is None:
             return {"success": False, "error": "Dados brutos não encontrados"}
 
-        with open(massive_data_path, "r", encoding="utf-8") as f:
-            massive_data = json.load(f)
-        
         return await self.analyze_data_quality(massive_data) # Reutiliza o método existente
 
     async def _generate_strategic_recommendations(self, insights: Dict[str, Any]) -> Dict[str, Any]:
@@ -1336,7 +1357,7 @@ class PredictiveAnalyticsEngine:
         # Curto Prazo: Baseado em oportunidades imediatas e riscos urgentes
         emerging_topics = insights.get("opportunity_mapping", {}).get("content_strategy", [])
         if emerging_topics:
-            strategic_recommendations["short_term"].append({"action": f"Focar na criação de conteúdo sobre os tópicos emergentes: {emerging_topics[0].get("description", "")}", "priority": "Alta"})
+            strategic_recommendations["short_term"].append({"action": f"Focar na criação de conteúdo sobre os tópicos emergentes: {emerging_topics[0].get('description', '')}", "priority": "Alta"})
         
         sentiment_shifts = insights.get("risk_assessment", {}).get("identified_risks", [])
         for risk in sentiment_shifts:
@@ -1345,7 +1366,7 @@ class PredictiveAnalyticsEngine:
 
         # Médio Prazo: Baseado em tendências e padrões de engajamento
         if insights.get("predictions", {}).get("viral_content_potential"):
-            strategic_recommendations["medium_term"].append({"action": f"Desenvolver campanhas de marketing com base nos drivers de viralidade identificados em {insights["predictions"]["viral_content_potential"]["most_viral_platform"]}.", "priority": "Média"})
+            strategic_recommendations["medium_term"].append({"action": f"Desenvolver campanhas de marketing com base nos drivers de viralidade identificados em {insights['predictions']['viral_content_potential']['most_viral_platform']}.", "priority": "Média"})
         
         if insights.get("engagement_patterns", {}).get("engagement_by_platform"):
             top_platform = max(insights["engagement_patterns"]["engagement_by_platform"], key=insights["engagement_patterns"]["engagement_by_platform"].get)
@@ -1354,7 +1375,7 @@ class PredictiveAnalyticsEngine:
         # Longo Prazo: Baseado em cenários e oportunidades de desenvolvimento de produto
         product_opportunities = insights.get("opportunity_mapping", {}).get("product_development", [])
         if product_opportunities:
-            strategic_recommendations["long_term"].append({"action": f"Investir em pesquisa e desenvolvimento para novos produtos/serviços alinhados com {product_opportunities[0].get("description", "")}.", "priority": "Alta"})
+            strategic_recommendations["long_term"].append({"action": f"Investir em pesquisa e desenvolvimento para novos produtos/serviços alinhados com {product_opportunities[0].get('description', '')}.", "priority": "Alta"})
         
         if insights.get("scenarios", {}).get("optimistic"):
             strategic_recommendations["long_term"].append({"action": insights["scenarios"]["optimistic"]["recommendation"], "priority": "Flexível"})
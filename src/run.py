@@ -30,6 +30,16 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# uvloop como política de event loop (loop libuv em C): reduz o overhead por
+# callback de todos os `await` do orquestrador de busca, que roda centenas de
+# chamadas HTTP sobrepostas. Sem o pacote (ex: Windows), mantém o loop padrão.
+try:
+    import uvloop
+    uvloop.install()
+    logger.info("⚡ uvloop instalado como event loop padrão")
+except ImportError:
+    logger.debug("uvloop não disponível; usando event loop padrão do asyncio")
+
 def create_app():
     """Cria e configura a aplicação Flask"""
 
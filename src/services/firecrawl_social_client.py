@@ -25,11 +25,20 @@ class FirecrwalSocialClient:
         self.enabled = bool(self.api_key)
         self.headers = {"Authorization": f"Bearer {self.api_key}"}
 
+        # Sessão HTTP persistente: reaproveita a conexão TLS (keep-alive)
+        # entre as buscas por plataforma em vez de abrir uma por requisição
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+
         if self.enabled:
             logger.info("🔥 Firecrwal Social Client ATIVO")
         else:
             logger.warning("⚠️ FIRECRWAL_API_KEY não configurado")
 
+    def close(self):
+        """Fecha a sessão HTTP persistente (chamar no shutdown da aplicação)"""
+        self._session.close()
+
     def get_provider_status(self) -> Dict[str, Any]:
         """Retorna status do provedor Firecrwal"""
         return {
@@ -78,9 +87,8 @@ class FirecrwalSocialClient:
                 "return_only_urls": False
             }
             
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/search",
-                headers=self.headers,
                 json=payload,
                 timeout=30
             )
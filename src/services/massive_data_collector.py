@@ -38,8 +38,25 @@ class MassiveDataCollector:
         self.total_content_length = 0
         self.sources_count = 0
 
+        # Executor dedicado para I/O de arquivos, isolado do executor padrão
+        # do asyncio para não competir com outros serviços (ex: análise preditiva)
+        self.io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mdc-io")
+
+        # Diretório base das sessões (evita reconstruir o Path a cada chamada)
+        self._base_dir = Path("analyses_data")
+
         logger.info("🚀 Massive Data Collector inicializado")
 
+    @staticmethod
+    def _write_json_sync(path: Path, data: Dict[str, Any]) -> None:
+        """Escreve um dicionário em JSON de forma síncrona (para uso via executor)"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    async def aclose(self):
+        """Encerra recursos do coletor (executor de I/O)"""
+        self.io_executor.shutdown(wait=False)
+
     def collect_comprehensive_data(
         self,
         produto: str,
@@ -69,7 +86,6 @@ class MassiveDataCollector:
             }
             
             # Chama o método assíncrono de forma síncrona
-            import asyncio
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             try:
@@ -94,19 +110,21 @@ class MassiveDataCollector:
         logger.info(f"🚀 INICIANDO COLETA MASSIVA APRIMORADA - Sessão: {session_id}")
         start_time = time.time()
 
+        # Timestamp único para toda a coleta (evita chamadas repetidas a datetime.now)
+        collection_timestamp = datetime.now().isoformat()
+
         # Estrutura de dados consolidados
         massive_data = {
             "session_id": session_id,
             "query": query,
             "context": context,
-            "collection_started": datetime.now().isoformat(),
+            "collection_started": collection_timestamp,
             "web_search_data": {},
             "social_media_data": {},
             "trends_data": {},
             "supadata_results": {},
             "visual_content": {},
             "extracted_content": [],
-            "screenshots": [], # Adicionado para armazenar caminhos dos screenshots
             "statistics": {
                 "total_sources": 0,
                 "total_content_length": 0,
@@ -153,7 +171,7 @@ class MassiveDataCollector:
                         "all_platforms_data": social_results_raw,
                         "total_posts": social_results_raw.get("total_results", 0),
                         "platforms_analyzed": len(social_results_raw.get("platforms", {})),
-                        "extracted_at": datetime.now().isoformat()
+                        "extracted_at": collection_timestamp
                     }
                 else:
                     social_results = {
@@ -184,9 +202,10 @@ class MassiveDataCollector:
                     screenshot_results = await visual_content_capture.capture_screenshots(
                         selected_urls, session_id
                     )
+                    # Os caminhos ficam apenas em visual_content.successful_captures_paths
+                    # (fonte única de verdade; evita duplicar a lista na serialização)
                     massive_data["visual_content"] = screenshot_results
                     massive_data["statistics"]["screenshot_count"] = screenshot_results.get("successful_captures", 0)
-                    massive_data["screenshots"] = screenshot_results.get("successful_captures_paths", []) # Salva os caminhos dos screenshots
                 except Exception as capture_error:
                     logger.error(f"❌ Erro na captura de screenshots: {capture_error}")
                     massive_data["visual_content"] = {"success": False, "error": str(capture_error)}
@@ -257,23 +276,33 @@ class MassiveDataCollector:
             })
 
             # Salva dados coletados em um arquivo JSON para a sessão
-            session_dir = Path(f"analyses_data/{session_id}")
+            session_dir = self._base_dir / session_id
             session_dir.mkdir(parents=True, exist_ok=True)
             massive_data_path = session_dir / "massive_data_collected.json"
-            with open(massive_data_path, "w", encoding="utf-8") as f:
-                json.dump(massive_data, f, ensure_ascii=False, indent=2)
+            loop = asyncio.get_running_loop()
+            massive_write_task = loop.run_in_executor(
+                self.io_executor, self._write_json_sync, massive_data_path, massive_data
+            )
+
+            # Gera o relatório de coleta em paralelo ao dump principal
+            # (as duas escritas se sobrepõem em vez de serializar)
+            collection_report, _ = await asyncio.gather(
+                self._generate_collection_report(
+                    massive_data, session_id, timestamp=collection_timestamp
+                ),
+                massive_write_task,
+            )
             logger.info(f"✅ Dados massivos coletados salvos em: {massive_data_path}")
 
-            # Gera relatório de coleta com referências às imagens
-            collection_report = await self._generate_collection_report(massive_data, session_id)
-
             # Salva dados coletados via auto_save_manager também
             salvar_etapa("massive_data_collected", massive_data, categoria="coleta_massiva", session_id=session_id)
 
-            logger.info(f"✅ COLETA MASSIVA APRIMORADA CONCLUÍDA")
-            logger.info(f"📊 {total_sources} fontes coletadas em {collection_time:.2f}s")
-            logger.info(f"📝 {total_content:,} caracteres de conteúdo")
-            logger.info(f"📸 {massive_data['statistics']['screenshot_count']} screenshots capturados")
+            # Evita formatar os argumentos quando o nível INFO está desabilitado
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ COLETA MASSIVA APRIMORADA CONCLUÍDA")
+                logger.info(f"📊 {total_sources} fontes coletadas em {collection_time:.2f}s")
+                logger.info(f"📝 {total_content:,} caracteres de conteúdo")
+                logger.info(f"📸 {massive_data['statistics']['screenshot_count']} screenshots capturados")
 
             return massive_data
 
@@ -306,13 +335,15 @@ class MassiveDataCollector:
             logger.error(f"Erro ao contar resultados sociais: {e}")
             return 0
 
-    async def _generate_collection_report(self, massive_data: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    async def _generate_collection_report(
+        self, massive_data: Dict[str, Any], session_id: str, timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Gera um relatório de coleta de dados com referências a screenshots."""
         report = {
             "title": "Relatório Detalhado de Coleta de Dados",
             "session_id": session_id,
             "query": massive_data.get("query", "N/A"),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "statistics": massive_data.get("statistics", {}),
             "visual_content_summary": {
                 "screenshot_count": massive_data.get("statistics", {}).get("screenshot_count", 0),
@@ -328,11 +359,11 @@ class MassiveDataCollector:
         }
 
         # Salva o relatório em um arquivo JSON
-        report_dir = Path(f"analyses_data/{session_id}")
+        report_dir = self._base_dir / session_id
         report_dir.mkdir(parents=True, exist_ok=True)
         report_path = report_dir / "relatorio_coleta_detalhado.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.io_executor, self._write_json_sync, report_path, report)
         logger.info(f"✅ Relatório de coleta detalhado salvo em: {report_path}")
 
         return report
@@ -8,7 +8,7 @@ Serviço para orquestrar o motor de análise preditiva
 import logging
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
@@ -25,13 +25,17 @@ class PredictiveAnalyticsService:
         self.engine = PredictiveAnalyticsEngine()
         logger.info("📊 Predictive Analytics Service inicializado")
 
-    async def analyze_all_data(self, session_id: str) -> Dict[str, Any]:
-        """Realiza a análise preditiva de todos os dados coletados para uma sessão."""
+    async def analyze_all_data(self, session_id: str, massive_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Realiza a análise preditiva de todos os dados coletados para uma sessão.
+
+        Quando `massive_data` é fornecido (ex: logo após execute_massive_collection),
+        o engine usa o dicionário em memória e evita reler o JSON do disco.
+        """
         logger.info(f"📊 Iniciando análise preditiva para sessão: {session_id}")
-        
+
         try:
             # A chamada principal para o engine que orquestra todas as análises
-            predictive_analysis_results = await self.engine.analyze_session_data(session_id)
+            predictive_analysis_results = await self.engine.analyze_session_data(session_id, massive_data=massive_data)
 
             salvar_etapa("predictive_analysis_results", predictive_analysis_results, categoria="analise_preditiva", session_id=session_id)
             logger.info(f"✅ Análise preditiva concluída para sessão: {session_id}")
@@ -49,6 +53,10 @@ class PredictiveAnalyticsService:
         """Expõe o método de análise de chunk do engine para uso externo, se necessário."""
         return await self.engine.analyze_content_chunk(text_content)
 
+    async def analyze_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, float]]:
+        """Expõe a análise de sentimento em lote do engine (um score por texto)."""
+        return await self.engine.analyze_sentiment_batch(texts, batch_size=batch_size)
+
     async def analyze_data_quality(self, massive_data: Dict[str, Any]) -> Dict[str, Any]:
         """Expõe o método de análise de qualidade de dados do engine para uso externo, se necessário."""
         return await self.engine.analyze_data_quality(massive_data)
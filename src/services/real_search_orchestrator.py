@@ -9,25 +9,197 @@ import os
 import logging
 import asyncio
 import aiohttp
+import hashlib
+import re
 import time
 from typing import Dict, List, Any, Optional
+from collections import Counter
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlsplit, urlunsplit
 import json
 
-from services.predictive_analytics_service import predictive_analytics_service # Import adicionado
+# Import condicional do Redis para cache de respostas de provedores
+try:
+    import redis.asyncio as aioredis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
+# Import condicional do ijson para parse incremental de respostas grandes
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Import condicional do NumPy para vetorização em corpora sociais grandes
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Import condicional do orjson (decode JSON em C, 2-5× mais rápido que o stdlib)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Import condicional do Hyperscan (DFA multi-padrão em C para varrer os
+# corpos grandes de Firecrawl/Jina em uma única passada)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+# Import condicional do httpx com HTTP/2 (multiplexa chamadas aos gateways
+# do Google sobre 1-2 conexões TLS; exige o extra httpx[http2])
+try:
+    import httpx
+    import h2  # noqa: F401 — requerido pelo modo http2 do httpx
+    HAS_HTTPX_HTTP2 = True
+except ImportError:
+    HAS_HTTPX_HTTP2 = False
 
 logger = logging.getLogger(__name__)
 
+# Padrões pré-compilados para extração de resultados de conteúdo textual.
+# Classes de caracteres limitadas no lugar de `.*?` evitam backtracking
+# patológico em markdown de megabytes retornado por Firecrawl/Jina.
+_MD_LINK_RE = re.compile(r'\[([^\]]{1,200})\]\((https?://[^\s)]+)\)')
+_BARE_URL_RE = re.compile(r'https?://[^\s<>"\']+')
+
+# Limite de conteúdo varrido pelos regex por resposta
+_MAX_EXTRACT_CONTENT_LEN = 2_000_000
+
+# Sessões de browser headless simultâneas na captura de screenshots
+_SCREENSHOT_WAVE_SIZE = 8
+
+# Banco Hyperscan com os dois padrões de extração compilados em um único DFA;
+# compilado sob demanda na primeira extração
+_HS_MD_LINK_ID = 1
+_HS_BARE_URL_ID = 2
+_hs_db = None
+
+def _get_hyperscan_db():
+    """Retorna o banco Hyperscan compartilhado, compilando-o na primeira chamada"""
+    global _hs_db
+    if _hs_db is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[
+                rb'\[[^\]]{1,200}\]\(https?://[^\s)]+\)',
+                rb'https?://[^\s<>"\']+',
+            ],
+            ids=[_HS_MD_LINK_ID, _HS_BARE_URL_ID],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * 2,
+        )
+        _hs_db = db
+    return _hs_db
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """Registro enxuto de resultado de busca.
+
+    Substitui o dict por item (~240 bytes de overhead cada) por um registro
+    com __slots__: em buscas com milhares de resultados isso corta a memória
+    por item em ~4× e acelera o acesso a campos na deduplicação e nas
+    estatísticas. Os registros são convertidos para dicts apenas na borda do
+    payload, onde o resultado é serializado em JSON.
+    """
+    title: str = ''
+    url: str = ''
+    snippet: str = ''
+    source: str = ''
+    relevance_score: float = 0.0
+    content: str = ''
+    content_length: int = 0
+    platform: str = ''
+    likes: int = 0
+    comments: int = 0
+    shares: int = 0
+    published_at: str = ''
+
+class TokenBucket:
+    """Limitador de vazão assíncrono (token bucket) para um provedor.
+
+    Suaviza rajadas dentro da janela de quota do provedor: com muitas buscas
+    concorrentes é possível estourar o QPS do Google/YouTube em milissegundos,
+    e os 429s resultantes desperdiçam o orçamento da fase inteira.
+
+    Deliberadamente sem asyncio.Lock: os buckets vivem no singleton, mas as
+    rotas executam cada busca em um event loop próprio e descartado — um Lock
+    criado no primeiro loop levantaria "bound to a different event loop" nos
+    seguintes. Toda a mutação de estado acontece sem await no meio, então
+    dentro de um loop ela já é atômica por construção.
+    """
+
+    __slots__ = ('rate', 'burst', 'tokens', 'last')
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Consome um token, dormindo o mínimo necessário se o balde esvaziou"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1:
+            wait = (1 - self.tokens) / self.rate
+            # Zera antes do sleep: quem chegar durante a espera enxerga o
+            # balde vazio e enfileira a própria espera a partir daí
+            self.tokens = 0.0
+            await asyncio.sleep(wait)
+        else:
+            self.tokens -= 1
+
 class RealSearchOrchestrator:
     """Orquestrador de busca REAL massiva - ZERO SIMULAÇÃO"""
 
+    # Forma fixa da instância: elimina o __dict__ por instância e acelera
+    # o acesso a atributos nos hot paths de rotação de chaves
+    __slots__ = (
+        'api_keys',
+        'key_indices',
+        'key_health',
+        'providers',
+        'service_urls',
+        'session_stats',
+        '_session',
+        '_session_loop',
+        '_redis',
+        '_redis_loop',
+        '_cache_ttls',
+        '_default_cache_ttl',
+        '_http2_client',
+        '_http2_loop',
+        'rate_limiters',
+        '_pa_svc',
+        '_request_tpls',
+        'debug_keep_raw',
+    )
+
     def __init__(self):
         """Inicializa orquestrador com todas as APIs reais"""
         self.api_keys = self._load_all_api_keys()
         self.key_indices = {provider: 0 for provider in self.api_keys.keys()}
 
+        # Saúde por chave: 'healthy', 'rate_limited' (quarentena até 'until') ou 'dead'
+        self.key_health: Dict[str, Dict[str, Dict[str, Any]]] = {
+            provider: {
+                key: {'state': 'healthy', 'until': 0.0, 'cooldown': 60.0}
+                for key in keys
+            }
+            for provider, keys in self.api_keys.items()
+        }
+
         # Provedores em ordem de prioridade
         self.providers = [
             'ALIBABA_WEBSAILOR',  # Adicionado como prioridade máxima
@@ -55,13 +227,319 @@ class RealSearchOrchestrator:
             'total_searches': 0,
             'successful_searches': 0,
             'failed_searches': 0,
-            'api_rotations': {},
+            # Counter pré-populado: o incremento em get_next_api_key fica
+            # sem o branch "if provider not in ..."
+            'api_rotations': Counter({provider: 0 for provider in self.api_keys}),
             'content_extracted': 0,
             'screenshots_captured': 0
         }
 
+        # Sessão HTTP compartilhada entre todos os provedores (keep-alive +
+        # pool), junto com o event loop no qual ela foi criada
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[Any] = None
+
+        # Cliente HTTP/2 compartilhado para endpoints do Google (quando
+        # disponível), junto com o event loop no qual ele foi criado
+        self._http2_client: Optional[Any] = None
+        self._http2_loop: Optional[Any] = None
+
+        # Corpos brutos nos retornos só quando depurando explicitamente:
+        # cada raw_content de 2KB acabava serializado no payload final/Redis
+        self.debug_keep_raw = os.getenv('ORCHESTRATOR_KEEP_RAW', '0') == '1'
+
+        # Partes estáticas de payload/params por provedor, montadas uma vez:
+        # cada chamada só substitui os campos dinâmicos (chave, cx, query)
+        self._request_tpls = {
+            'FIRECRAWL': {
+                'formats': ['markdown', 'html'],
+                'onlyMainContent': True,
+                'includeTags': ['p', 'h1', 'h2', 'h3', 'article'],
+                'excludeTags': ['nav', 'footer', 'aside', 'script'],
+                'waitFor': 3000
+            },
+            'GOOGLE': {'num': 10, 'hl': 'pt-BR', 'gl': 'BR'},
+            'EXA': {'num_results': 10, 'type': 'search'},
+            'SERPER': {'gl': 'br', 'hl': 'pt'},
+            'YOUTUBE': {
+                'part': 'snippet',
+                'type': 'video',
+                'maxResults': 10,
+                'regionCode': 'BR',
+                'relevanceLanguage': 'pt'
+            },
+            'SUPADATA': {'platforms': ['instagram', 'facebook', 'tiktok'], 'num_results': 10},
+        }
+
+        # Limitadores de vazão client-side por provedor (tokens/s, burst):
+        # evita disparar 429 nos provedores antes mesmo da primeira resposta
+        self.rate_limiters = {
+            'FIRECRAWL': TokenBucket(2, 4),
+            'JINA': TokenBucket(5, 10),
+            'GOOGLE': TokenBucket(10, 20),
+            'EXA': TokenBucket(5, 10),
+            'SERPER': TokenBucket(10, 20),
+            'YOUTUBE': TokenBucket(10, 20),
+            'SUPADATA': TokenBucket(2, 4),
+        }
+
+        # Cache Redis de respostas por (provedor, query); TTL menor para web,
+        # maior para YouTube (resultados mais estáveis). O loop de criação
+        # acompanha o cliente, como nos clientes HTTP.
+        self._redis: Optional[Any] = None
+        self._redis_loop: Optional[Any] = None
+        self._cache_ttls = {'YOUTUBE': 3600}
+        self._default_cache_ttl = 600
+
+        # Serviço de análise preditiva, importado sob demanda na FASE 6
+        # (o import puxa numpy/sklearn; workers que só servem busca não pagam)
+        self._pa_svc: Optional[Any] = None
+
         logger.info(f"🚀 Real Search Orchestrator inicializado com {sum(len(keys) for keys in self.api_keys.values())} chaves totais")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão HTTP compartilhada, criando-a na primeira chamada.
+
+        Reutilizar uma única sessão elimina handshake TCP+TLS e lookup DNS
+        por chamada de provedor, habilitando keep-alive entre as fases.
+
+        As rotas executam cada busca em um event loop próprio e descartado, e
+        uma sessão presa a um loop fechado ainda reporta closed == False —
+        qualquer chamada nela levanta "Event loop is closed". Por isso a
+        sessão é recriada sempre que o loop corrente muda.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Melhor esforço: as conexões da sessão antiga pertencem a um
+                # loop já fechado, então o close pode falhar sem consequência
+                try:
+                    await self._session.close()
+                except Exception as e:
+                    logger.debug(f"⚠️ Falha ao fechar sessão do loop anterior: {e}")
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+            self._session_loop = loop
+        return self._session
+
+    def _get_http2_client(self) -> Optional[Any]:
+        """Retorna o cliente httpx HTTP/2 compartilhado (None sem httpx[http2]).
+
+        Google/YouTube ficam atrás de gateways HTTP/2; multiplexar as chamadas
+        sobre poucas conexões TLS evita novos handshakes sob concorrência.
+
+        Como a sessão aiohttp, o cliente é recriado quando o event loop
+        corrente muda: as conexões keep-alive do loop descartado estão mortas
+        e qualquer uso delas levanta "Event loop is closed".
+        """
+        if not HAS_HTTPX_HTTP2:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._http2_client is None or self._http2_loop is not loop:
+            # O cliente antigo não pode ser fechado daqui (aclose é async e o
+            # loop dele já morreu); abandoná-lo é inócuo — as conexões caíram
+            # junto com o loop
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+            self._http2_loop = loop
+        return self._http2_client
+
+    async def close(self):
+        """Fecha os clientes HTTP compartilhados (chamar no shutdown da aplicação)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+        self._http2_client = None
+        self._http2_loop = None
+
+    @staticmethod
+    def _project_google_item(item: Dict[str, Any]) -> SearchResult:
+        """Projeta um item do Google Custom Search no registro padrão"""
+        return SearchResult(
+            title=item.get('title') or '',
+            url=item.get('link') or '',
+            snippet=item.get('snippet') or '',
+            source='google'
+        )
+
+    @staticmethod
+    def _project_youtube_item(item: Dict[str, Any]) -> SearchResult:
+        """Projeta um item da YouTube Data API no registro padrão"""
+        return SearchResult(
+            title=item['snippet']['title'],
+            url=f"https://www.youtube.com/watch?v={item['id']['videoId']}",
+            snippet=item['snippet']['description'],
+            source='youtube',
+            published_at=item['snippet'].get('publishedAt', '')
+        )
+
+    @staticmethod
+    def _should_stream_json(response) -> bool:
+        """Decide se vale parsear a resposta incrementalmente com ijson.
+
+        Abaixo de 16KB o overhead do parser incremental domina; sem
+        Content-Length assume corpo grande.
+        """
+        if not HAS_IJSON:
+            return False
+        content_length = response.headers.get('Content-Length')
+        if content_length is None:
+            return True
+        return int(content_length) >= 16 * 1024
+
+    def _get_redis(self) -> Optional[Any]:
+        """Retorna o cliente Redis compartilhado (None se Redis não disponível).
+
+        O cliente e seu pool são recriados quando o event loop corrente muda:
+        conexões abertas em um loop já descartado falham em toda leitura e
+        escrita, deixando o cache permanentemente inerte.
+        """
+        if not HAS_REDIS:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._redis_loop is not loop:
+            # O pool antigo não pode ser desconectado daqui (operação async
+            # em um loop morto); as conexões dele já caíram com o loop
+            self._redis = aioredis.Redis(
+                connection_pool=aioredis.ConnectionPool.from_url(
+                    os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
+                    max_connections=32
+                )
+            )
+            self._redis_loop = loop
+        return self._redis
+
+    async def _cached_search(self, provider: str, query: str, fetcher) -> Dict[str, Any]:
+        """Cacheia a resposta de um provedor no Redis, chaveada por (provedor, query).
+
+        Um hit evita a ida HTTPS inteira e preserva quota de API; respostas
+        com success=False não são cacheadas. Sem Redis, executa direto.
+        """
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return await fetcher()
+
+        cache_key = f"search_cache:{provider}:{hashlib.sha1(query.encode('utf-8')).hexdigest()}"
+
+        try:
+            cached = await redis_client.get(cache_key)
+            if cached:
+                logger.debug(f"⚡ Cache hit para {provider}: {query[:50]}")
+                data = json.loads(cached)
+                # Reidrata os registros enxutos a partir dos dicts do cache
+                if isinstance(data.get('results'), list):
+                    data['results'] = [SearchResult(**item) for item in data['results']]
+                return data
+        except Exception as e:
+            logger.debug(f"⚠️ Redis indisponível para leitura ({e}), buscando direto")
+            return await fetcher()
+
+        result = await fetcher()
+
+        if result.get('success'):
+            ttl = self._cache_ttls.get(provider, self._default_cache_ttl)
+            payload = dict(result)
+            if isinstance(payload.get('results'), list):
+                payload['results'] = [asdict(item) for item in payload['results']]
+            try:
+                await redis_client.setex(cache_key, ttl, json.dumps(payload, ensure_ascii=False))
+            except Exception as e:
+                logger.debug(f"⚠️ Falha ao gravar cache Redis para {provider}: {e}")
+
+        return result
+
+    async def _throttle(self, provider: str) -> None:
+        """Aguarda um token do limitador de vazão do provedor, se configurado"""
+        bucket = self.rate_limiters.get(provider)
+        if bucket is not None:
+            await bucket.acquire()
+
+    async def _guarded_search(
+        self,
+        provider: str,
+        coro,
+        sem: asyncio.Semaphore,
+        errors: List[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        """Executa a busca de um provedor sob o semáforo de concorrência.
+
+        Falhas são registradas em `errors` e retornam None, de modo que um
+        provedor quebrado não cancela os irmãos nem estoura o TaskGroup.
+        Semáforo e lista de erros são criados por busca: ambos no singleton
+        criariam acoplamento ao loop e corrida entre sessões concorrentes.
+        """
+        async with sem:
+            try:
+                return await coro
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Erro na busca {provider}: {e}")
+                errors.append({'provider': provider, 'error': str(e)})
+                return None
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Normaliza URL para deduplicação (host minúsculo, sem barra final)"""
+        try:
+            parts = urlsplit(url)
+            return urlunsplit((
+                parts.scheme.lower(),
+                parts.netloc.lower(),
+                parts.path.rstrip('/'),
+                parts.query,
+                ''
+            ))
+        except ValueError:
+            return url
+
+    def _merge_results(
+        self,
+        target: List[SearchResult],
+        new_results: List[SearchResult],
+        seen: Dict[str, int]
+    ) -> int:
+        """Insere resultados em `target` deduplicando por URL normalizada.
+
+        Duplicatas são rejeitadas na inserção (O(1) por item), mantendo
+        apenas a instância de maior relevance_score de cada URL — evita
+        carregar 30-50% de URLs repetidas para as fases seguintes. Retorna o
+        delta de bytes de conteúdo inseridos, fundindo a passada de
+        estatísticas com a de merge; o acumulador fica na busca chamadora,
+        como os índices `seen` — estado no singleton misturaria coletas
+        concorrentes.
+        """
+        content_bytes = 0
+        for result in new_results:
+            url = result.url
+            if not url:
+                target.append(result)
+                content_bytes += len(result.content)
+                continue
+
+            normalized = self._normalize_url(url)
+            index = seen.get(normalized)
+            if index is None:
+                seen[normalized] = len(target)
+                target.append(result)
+                content_bytes += len(result.content)
+            elif result.relevance_score > target[index].relevance_score:
+                content_bytes += len(result.content) - len(target[index].content)
+                target[index] = result
+        return content_bytes
+
     def _load_all_api_keys(self) -> Dict[str, List[str]]:
         """Carrega todas as chaves de API do ambiente"""
         api_keys = {}
@@ -91,26 +569,66 @@ class RealSearchOrchestrator:
         return api_keys
 
     def get_next_api_key(self, provider: str) -> Optional[str]:
-        """Obtém próxima chave de API com rotação automática"""
+        """Obtém próxima chave de API saudável com rotação automática.
+
+        Chaves mortas (401) são puladas; chaves em rate limit (429) voltam
+        à rotação depois que o cooldown expira.
+        """
         if provider not in self.api_keys or not self.api_keys[provider]:
             return None
 
         keys = self.api_keys[provider]
-        current_index = self.key_indices[provider]
-
-        # Obtém chave atual
-        key = keys[current_index]
-
-        # Rotaciona para próxima
-        self.key_indices[provider] = (current_index + 1) % len(keys)
-
-        # Atualiza estatísticas
-        if provider not in self.session_stats['api_rotations']:
-            self.session_stats['api_rotations'][provider] = 0
-        self.session_stats['api_rotations'][provider] += 1
-
-        logger.debug(f"🔄 {provider}: Usando chave {current_index + 1}/{len(keys)}")
-        return key
+        health = self.key_health.get(provider, {})
+        now = time.time()
+
+        for _ in range(len(keys)):
+            current_index = self.key_indices[provider]
+            key = keys[current_index]
+
+            # Rotaciona para próxima
+            self.key_indices[provider] = (current_index + 1) % len(keys)
+
+            key_state = health.get(key, {})
+            if key_state.get('state') == 'dead':
+                continue
+            if key_state.get('state') == 'rate_limited':
+                if now < key_state.get('until', 0.0):
+                    continue
+                key_state['state'] = 'healthy'
+
+            # Atualiza estatísticas
+            self.session_stats['api_rotations'][provider] += 1
+
+            logger.debug(f"🔄 {provider}: Usando chave {current_index + 1}/{len(keys)}")
+            return key
+
+        logger.warning(f"⚠️ {provider}: Nenhuma chave saudável disponível no momento")
+        return None
+
+    def report_key_result(self, provider: str, key: Optional[str], status_code: int):
+        """Atualiza a saúde de uma chave a partir do status HTTP da resposta.
+
+        401 marca a chave como morta; 429 a coloca em quarentena com backoff
+        exponencial; qualquer 2xx a restaura como saudável.
+        """
+        if not key:
+            return
+
+        key_state = self.key_health.get(provider, {}).get(key)
+        if key_state is None:
+            return
+
+        if status_code == 401:
+            key_state['state'] = 'dead'
+            logger.warning(f"🔒 {provider}: Chave revogada (401) removida da rotação")
+        elif status_code == 429:
+            key_state['state'] = 'rate_limited'
+            key_state['until'] = time.time() + key_state['cooldown']
+            logger.warning(f"⏳ {provider}: Chave em rate limit por {key_state['cooldown']:.0f}s")
+            key_state['cooldown'] = min(key_state['cooldown'] * 2, 900.0)
+        elif 200 <= status_code < 300:
+            key_state['state'] = 'healthy'
+            key_state['cooldown'] = 60.0
 
     async def execute_massive_real_search(
         self, 
@@ -123,6 +641,15 @@ class RealSearchOrchestrator:
         logger.info(f"🚀 INICIANDO BUSCA REAL MASSIVA para: {query}")
         start_time = time.time()
 
+        # Bytes de conteúdo acumulados incrementalmente durante os merges
+        content_bytes = 0
+
+        # Estado por busca: semáforo e erros vivem na chamada, não no
+        # singleton — o semáforo se prenderia ao primeiro loop que o
+        # disputasse, e a lista de erros misturaria sessões concorrentes
+        provider_sem = asyncio.Semaphore(8)
+        provider_errors: List[Dict[str, str]] = []
+
         # Estrutura de resultados
         search_results = {
             'query': query,
@@ -134,6 +661,7 @@ class RealSearchOrchestrator:
             'youtube_results': [],
             'viral_content': [],
             'screenshots_captured': [],
+            'provider_errors': provider_errors,
             'statistics': {
                 'total_sources': 0,
                 'unique_urls': 0,
@@ -143,14 +671,22 @@ class RealSearchOrchestrator:
             }
         }
 
+        # Índices de URLs já vistas por lista de destino (dedup na inserção)
+        web_seen: Dict[str, int] = {}
+        social_seen: Dict[str, int] = {}
+        youtube_seen: Dict[str, int] = {}
+
+        # Provedores que contribuíram (set: membership O(1), sem duplicatas)
+        providers_used: set = set()
+
         try:
             # FASE 1: Busca com Alibaba WebSailor (prioritária)
             logger.info("🔍 FASE 1: Busca com Alibaba WebSailor")
             websailor_results = await self._search_alibaba_websailor(query, context)
-            
+
             if websailor_results.get('success'):
-                search_results['web_results'].extend(websailor_results['results'])
-                search_results['providers_used'].append('ALIBABA_WEBSAILOR')
+                content_bytes += self._merge_results(search_results['web_results'], websailor_results['results'], web_seen)
+                providers_used.add('ALIBABA_WEBSAILOR')
                 logger.info(f"✅ Alibaba WebSailor retornou {len(websailor_results['results'])} resultados")
 
             # FASE 2: Busca Web Massiva Simultânea (provedores restantes)
@@ -159,36 +695,62 @@ class RealSearchOrchestrator:
 
             # Firecrawl
             if 'FIRECRAWL' in self.api_keys:
-                web_tasks.append(self._search_firecrawl(query))
+                web_tasks.append(('FIRECRAWL', self._cached_search(
+                    'FIRECRAWL', query, lambda: self._search_firecrawl(query))))
 
             # Jina
             if 'JINA' in self.api_keys:
-                web_tasks.append(self._search_jina(query))
+                web_tasks.append(('JINA', self._cached_search(
+                    'JINA', query, lambda: self._search_jina(query))))
 
             # Google
             if 'GOOGLE' in self.api_keys:
-                web_tasks.append(self._search_google(query))
+                web_tasks.append(('GOOGLE', self._cached_search(
+                    'GOOGLE', query, lambda: self._search_google(query))))
 
             # Exa
             if 'EXA' in self.api_keys:
-                web_tasks.append(self._search_exa(query))
+                web_tasks.append(('EXA', self._cached_search(
+                    'EXA', query, lambda: self._search_exa(query))))
 
             # Serper
             if 'SERPER' in self.api_keys:
-                web_tasks.append(self._search_serper(query))
-
-            # Executa todas as buscas web simultaneamente
-            if web_tasks:
-                web_results = await asyncio.gather(*web_tasks, return_exceptions=True)
+                web_tasks.append(('SERPER', self._cached_search(
+                    'SERPER', query, lambda: self._search_serper(query))))
 
-                for result in web_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"❌ Erro na busca web: {result}")
-                        continue
+            # Executa todas as buscas web simultaneamente, mesclando na ordem
+            # de chegada; ao atingir o alvo de URLs únicas, os provedores
+            # pendentes (tipicamente o mais lento) são cancelados — a latência
+            # da fase deixa de ser ditada pela cauda
+            web_target_unique_urls = 50
 
-                    if result.get('success') and result.get('results'):
-                        search_results['web_results'].extend(result['results'])
-                        search_results['providers_used'].append(result.get('provider', 'unknown'))
+            if web_tasks:
+                pending = {
+                    asyncio.create_task(self._guarded_search(provider, coro, provider_sem, provider_errors))
+                    for provider, coro in web_tasks
+                }
+                try:
+                    while pending:
+                        done, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            result = future.result()
+                            if result and result.get('success') and result.get('results'):
+                                content_bytes += self._merge_results(search_results['web_results'], result['results'], web_seen)
+                                providers_used.add(result.get('provider', 'unknown'))
+
+                        if len(web_seen) >= web_target_unique_urls and pending:
+                            logger.info(
+                                f"🎯 {len(web_seen)} URLs únicas coletadas; "
+                                f"cancelando {len(pending)} provedores pendentes"
+                            )
+                            break
+                finally:
+                    for task in pending:
+                        task.cancel()
+                    if pending:
+                        await asyncio.gather(*pending, return_exceptions=True)
 
             # FASE 3: Busca em Redes Sociais
             logger.info("📱 FASE 3: Busca massiva em redes sociais")
@@ -196,26 +758,28 @@ class RealSearchOrchestrator:
 
             # YouTube
             if 'YOUTUBE' in self.api_keys:
-                social_tasks.append(self._search_youtube(query))
+                social_tasks.append(('YOUTUBE', self._cached_search(
+                    'YOUTUBE', query, lambda: self._search_youtube(query))))
 
             # Supadata (Instagram, Facebook, TikTok)
             # if 'SUPADATA' in self.api_keys:
-            #     social_tasks.append(self._search_supadata(query))
+            #     social_tasks.append(('SUPADATA', self._search_supadata(query)))
 
             # Executa buscas sociais
             if social_tasks:
-                social_results = await asyncio.gather(*social_tasks, return_exceptions=True)
-
-                for result in social_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"❌ Erro na busca social: {result}")
-                        continue
-
-                    if result.get('success'):
+                async with asyncio.TaskGroup() as tg:
+                    social_futures = [
+                        tg.create_task(self._guarded_search(provider, coro, provider_sem, provider_errors))
+                        for provider, coro in social_tasks
+                    ]
+
+                for future in social_futures:
+                    result = future.result()
+                    if result and result.get('success'):
                         if result.get('platform') == 'youtube':
-                            search_results['youtube_results'].extend(result.get('results', []))
+                            content_bytes += self._merge_results(search_results['youtube_results'], result.get('results', []), youtube_seen)
                         else:
-                            search_results['social_results'].extend(result.get('results', []))
+                            content_bytes += self._merge_results(search_results['social_results'], result.get('results', []), social_seen)
 
             # FASE 4: Identificação de Conteúdo Viral
             logger.info("🔥 FASE 4: Identificando conteúdo viral")
@@ -233,25 +797,40 @@ class RealSearchOrchestrator:
 
             # FASE 6: Análise Preditiva dos dados coletados
             logger.info("📊 FASE 6: Realizando análise preditiva dos dados coletados...")
-            predictive_insights = await predictive_analytics_service.analyze_all_data(session_id)
+            if self._pa_svc is None:
+                from services.predictive_analytics_service import predictive_analytics_service
+                self._pa_svc = predictive_analytics_service
+            predictive_insights = await self._pa_svc.analyze_all_data(session_id)
             search_results['predictive_insights'] = predictive_insights
             logger.info(f"✅ Análise preditiva concluída e insights adicionados aos resultados da busca.")
 
-            # Calcula estatísticas finais
+            # Estatísticas finais a partir dos contadores incrementais do
+            # merge — sem re-varrer os resultados nem montar um set interino
             search_duration = time.time() - start_time
-            all_results = search_results['web_results'] + search_results['social_results'] + search_results['youtube_results']
-            unique_urls = list(set(r.get('url', '') for r in all_results if r.get('url')))
+            total_sources = (
+                len(search_results['web_results'])
+                + len(search_results['social_results'])
+                + len(search_results['youtube_results'])
+            )
 
             search_results['statistics'].update({
-                'total_sources': len(all_results),
-                'unique_urls': len(unique_urls),
-                'content_extracted': sum(len(r.get('content', '')) for r in all_results),
+                'total_sources': total_sources,
+                'unique_urls': len(web_seen) + len(social_seen) + len(youtube_seen),
+                'content_extracted': content_bytes,
                 'api_calls_made': sum(self.session_stats['api_rotations'].values()),
                 'search_duration': search_duration
             })
 
+            # Converte os registros enxutos para dicts apenas na borda do
+            # payload: os consumidores serializam o resultado em JSON
+            search_results['providers_used'] = sorted(providers_used)
+            search_results['web_results'] = [asdict(r) for r in search_results['web_results']]
+            search_results['social_results'] = [asdict(r) for r in search_results['social_results']]
+            search_results['youtube_results'] = [asdict(r) for r in search_results['youtube_results']]
+            search_results['viral_content'] = [asdict(r) for r in search_results['viral_content']]
+
             logger.info(f"✅ BUSCA REAL MASSIVA CONCLUÍDA em {search_duration:.2f}s")
-            logger.info(f"📊 {len(all_results)} resultados de {len(search_results['providers_used'])} provedores")
+            logger.info(f"📊 {total_sources} resultados de {len(search_results['providers_used'])} provedores")
             logger.info(f"📸 {len(search_results['screenshots_captured'])} screenshots capturados")
 
             return search_results
@@ -287,23 +866,25 @@ class RealSearchOrchestrator:
             fontes_detalhadas = research_result.get('conteudo_consolidado', {}).get('fontes_detalhadas', [])
             
             for fonte in fontes_detalhadas:
-                results.append({
-                    'title': fonte.get('title', ''),
-                    'url': fonte.get('url', ''),
-                    'snippet': '',  # WebSailor não fornece snippet diretamente
-                    'source': 'alibaba_websailor',
-                    'relevance_score': fonte.get('quality_score', 0.7),
-                    'content_length': fonte.get('content_length', 0)
-                })
+                results.append(SearchResult(
+                    title=fonte.get('title', ''),
+                    url=fonte.get('url', ''),
+                    snippet='',  # WebSailor não fornece snippet diretamente
+                    source='alibaba_websailor',
+                    relevance_score=fonte.get('quality_score', 0.7),
+                    content_length=fonte.get('content_length', 0)
+                ))
 
             logger.info(f"✅ Alibaba WebSailor processado com {len(results)} resultados")
-            
-            return {
+
+            out = {
                 'success': True,
                 'provider': 'ALIBABA_WEBSAILOR',
-                'results': results,
-                'raw_data': research_result
+                'results': results
             }
+            if self.debug_keep_raw:
+                out['raw_data'] = research_result
+            return out
 
         except ImportError:
             logger.warning("⚠️ Alibaba WebSailor não encontrado")
@@ -319,47 +900,45 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Firecrawl API key não disponível'}
 
+            await self._throttle('FIRECRAWL')
+
             # Busca no Google e extrai com Firecrawl
             search_url = f"https://www.google.com/search?q={quote_plus(query)}&hl=pt-BR&gl=BR"
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {api_key}',
-                    'Content-Type': 'application/json'
-                }
-
-                payload = {
-                    'url': search_url,
-                    'formats': ['markdown', 'html'],
-                    'onlyMainContent': True,
-                    'includeTags': ['p', 'h1', 'h2', 'h3', 'article'],
-                    'excludeTags': ['nav', 'footer', 'aside', 'script'],
-                    'waitFor': 3000
-                }
+            session = await self._get_session()
+            headers = {
+                'Authorization': f'Bearer {api_key}',
+                'Content-Type': 'application/json'
+            }
 
-                async with session.post(
-                    self.service_urls['FIRECRAWL'],
-                    json=payload,
-                    headers=headers,
-                    timeout=30
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        content = data.get('data', {}).get('markdown', '')
-
-                        # Extrai resultados do conteúdo
-                        results = self._extract_search_results_from_content(content, 'firecrawl')
-
-                        return {
-                            'success': True,
-                            'provider': 'FIRECRAWL',
-                            'results': results,
-                            'raw_content': content[:2000]
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Firecrawl erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+            payload = {**self._request_tpls['FIRECRAWL'], 'url': search_url}
+
+            async with session.post(
+                self.service_urls['FIRECRAWL'],
+                json=payload,
+                headers=headers,
+                timeout=30
+            ) as response:
+                self.report_key_result('FIRECRAWL', api_key, response.status)
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    content = data.get('data', {}).get('markdown', '')
+
+                    # Extrai resultados do conteúdo
+                    results = self._extract_search_results_from_content(content, 'firecrawl')
+
+                    out = {
+                        'success': True,
+                        'provider': 'FIRECRAWL',
+                        'results': results
+                    }
+                    if self.debug_keep_raw:
+                        out['raw_content'] = content[:2000]
+                    return out
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Firecrawl erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
 
         except Exception as e:
             logger.error(f"❌ Erro Firecrawl: {e}")
@@ -372,6 +951,8 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Jina API key não disponível'}
 
+            await self._throttle('JINA')
+
             # Busca múltiplas URLs com Jina
             search_urls = [
                 f"https://www.google.com/search?q={quote_plus(query)}&hl=pt-BR",
@@ -379,30 +960,22 @@ class RealSearchOrchestrator:
                 f"https://search.yahoo.com/search?p={quote_plus(query)}&ei=UTF-8"
             ]
 
-            results = []
+            session = await self._get_session()
+
+            # Dispara os três buscadores em paralelo através do proxy Jina
+            # (latência cai de ~3×RTT para ~1×RTT)
+            fetch_tasks = [
+                self._jina_fetch(session, api_key, search_url)
+                for search_url in search_urls
+            ]
+            chunks = await asyncio.gather(*fetch_tasks, return_exceptions=True)
 
-            async with aiohttp.ClientSession() as session:
-                for search_url in search_urls:
-                    try:
-                        jina_url = f"{self.service_urls['JINA']}{search_url}"
-                        headers = {
-                            'Authorization': f'Bearer {api_key}',
-                            'Accept': 'text/plain'
-                        }
-
-                        async with session.get(
-                            jina_url,
-                            headers=headers,
-                            timeout=30
-                        ) as response:
-                            if response.status == 200:
-                                content = await response.text()
-                                extracted_results = self._extract_search_results_from_content(content, 'jina')
-                                results.extend(extracted_results)
-
-                    except Exception as e:
-                        logger.warning(f"⚠️ Erro em URL Jina {search_url}: {e}")
-                        continue
+            results = []
+            for search_url, chunk in zip(search_urls, chunks):
+                if isinstance(chunk, Exception):
+                    logger.warning(f"⚠️ Erro em URL Jina {search_url}: {chunk}")
+                    continue
+                results.extend(chunk)
 
             return {
                 'success': True,
@@ -414,6 +987,25 @@ class RealSearchOrchestrator:
             logger.error(f"❌ Erro Jina: {e}")
             return {'success': False, 'error': str(e)}
 
+    async def _jina_fetch(self, session: aiohttp.ClientSession, api_key: str, search_url: str) -> List[Dict[str, Any]]:
+        """Busca uma URL via proxy Jina e extrai os resultados do conteúdo"""
+        jina_url = f"{self.service_urls['JINA']}{search_url}"
+        headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Accept': 'text/plain'
+        }
+
+        async with session.get(
+            jina_url,
+            headers=headers,
+            timeout=30
+        ) as response:
+            self.report_key_result('JINA', api_key, response.status)
+            if response.status != 200:
+                return []
+            content = await response.text()
+            return self._extract_search_results_from_content(content, 'jina')
+
     async def _search_google(self, query: str) -> Dict[str, Any]:
         """Busca REAL usando Google Custom Search API"""
         try:
@@ -422,35 +1014,49 @@ class RealSearchOrchestrator:
             if not api_key or not cx:
                 return {'success': False, 'error': 'Google API key ou CSE ID não disponível'}
 
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    'key': api_key,
-                    'cx': cx,
-                    'q': query,
-                    'num': 10,  # Número de resultados
-                    'hl': 'pt-BR', # Idioma da interface
-                    'gl': 'BR' # País de pesquisa
-                }
-                async with session.get(self.service_urls['GOOGLE'], params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        for item in data.get('items', []):
-                            results.append({
-                                'title': item.get('title'),
-                                'url': item.get('link'),
-                                'snippet': item.get('snippet'),
-                                'source': 'google'
-                            })
-                        return {
-                            'success': True,
-                            'provider': 'GOOGLE',
-                            'results': results
-                        }
+            await self._throttle('GOOGLE')
+
+            params = {**self._request_tpls['GOOGLE'], 'key': api_key, 'cx': cx, 'q': query}
+
+            # Caminho HTTP/2 multiplexado quando httpx[http2] está disponível
+            http2_client = self._get_http2_client()
+            if http2_client is not None:
+                response = await http2_client.get(self.service_urls['GOOGLE'], params=params)
+                self.report_key_result('GOOGLE', api_key, response.status_code)
+                if response.status_code == 200:
+                    data = _json_loads(response.content)
+                    results = [self._project_google_item(item) for item in data.get('items', [])]
+                    return {
+                        'success': True,
+                        'provider': 'GOOGLE',
+                        'results': results
+                    }
+                logger.error(f"❌ Google Search erro {response.status_code}: {response.text}")
+                return {'success': False, 'error': f'HTTP {response.status_code}'}
+
+            session = await self._get_session()
+            async with session.get(self.service_urls['GOOGLE'], params=params, timeout=30) as response:
+                self.report_key_result('GOOGLE', api_key, response.status)
+                if response.status == 200:
+                    results = []
+                    if self._should_stream_json(response):
+                        # Parse incremental: projeta apenas os campos de
+                        # interesse sem materializar o dict completo
+                        async for item in ijson.items_async(response.content, 'items.item'):
+                            results.append(self._project_google_item(item))
                     else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Google Search erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+                        data = _json_loads(await response.read())
+                        for item in data.get('items', []):
+                            results.append(self._project_google_item(item))
+                    return {
+                        'success': True,
+                        'provider': 'GOOGLE',
+                        'results': results
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Google Search erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
         except Exception as e:
             logger.error(f"❌ Erro Google Search: {e}")
             return {'success': False, 'error': str(e)}
@@ -462,36 +1068,35 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Exa API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'x-api-key': api_key,
-                    'Content-Type': 'application/json'
-                }
-                payload = {
-                    'query': query,
-                    'num_results': 10,
-                    'type': 'search' # Pode ser 'search' ou 'find_similar'
-                }
-                async with session.post(self.service_urls['EXA'], headers=headers, json=payload, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        for item in data.get('results', []):
-                            results.append({
-                                'title': item.get('title'),
-                                'url': item.get('url'),
-                                'snippet': item.get('text'), # Exa usa 'text' como snippet
-                                'source': 'exa'
-                            })
-                        return {
-                            'success': True,
-                            'provider': 'EXA',
-                            'results': results
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Exa API erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+            await self._throttle('EXA')
+
+            session = await self._get_session()
+            headers = {
+                'x-api-key': api_key,
+                'Content-Type': 'application/json'
+            }
+            payload = {**self._request_tpls['EXA'], 'query': query}
+            async with session.post(self.service_urls['EXA'], headers=headers, json=payload, timeout=30) as response:
+                self.report_key_result('EXA', api_key, response.status)
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    results = []
+                    for item in data.get('results', []):
+                        results.append(SearchResult(
+                            title=item.get('title') or '',
+                            url=item.get('url') or '',
+                            snippet=item.get('text') or '', # Exa usa 'text' como snippet
+                            source='exa'
+                        ))
+                    return {
+                        'success': True,
+                        'provider': 'EXA',
+                        'results': results
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Exa API erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
         except Exception as e:
             logger.error(f"❌ Erro Exa API: {e}")
             return {'success': False, 'error': str(e)}
@@ -503,36 +1108,35 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Serper API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'X-API-KEY': api_key,
-                    'Content-Type': 'application/json'
-                }
-                payload = {
-                    'q': query,
-                    'gl': 'br', # País
-                    'hl': 'pt' # Idioma
-                }
-                async with session.post(self.service_urls['SERPER'], headers=headers, json=payload, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        for item in data.get('organic', []):
-                            results.append({
-                                'title': item.get('title'),
-                                'url': item.get('link'),
-                                'snippet': item.get('snippet'),
-                                'source': 'serper'
-                            })
-                        return {
-                            'success': True,
-                            'provider': 'SERPER',
-                            'results': results
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Serper API erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+            await self._throttle('SERPER')
+
+            session = await self._get_session()
+            headers = {
+                'X-API-KEY': api_key,
+                'Content-Type': 'application/json'
+            }
+            payload = {**self._request_tpls['SERPER'], 'q': query}
+            async with session.post(self.service_urls['SERPER'], headers=headers, json=payload, timeout=30) as response:
+                self.report_key_result('SERPER', api_key, response.status)
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    results = []
+                    for item in data.get('organic', []):
+                        results.append(SearchResult(
+                            title=item.get('title') or '',
+                            url=item.get('link') or '',
+                            snippet=item.get('snippet') or '',
+                            source='serper'
+                        ))
+                    return {
+                        'success': True,
+                        'provider': 'SERPER',
+                        'results': results
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Serper API erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
         except Exception as e:
             logger.error(f"❌ Erro Serper API: {e}")
             return {'success': False, 'error': str(e)}
@@ -544,38 +1148,49 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'YouTube API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    'part': 'snippet',
-                    'q': query,
-                    'type': 'video',
-                    'maxResults': 10,
-                    'key': api_key,
-                    'regionCode': 'BR',
-                    'relevanceLanguage': 'pt'
-                }
-                async with session.get(self.service_urls['YOUTUBE'], params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        for item in data.get('items', []):
-                            results.append({
-                                'title': item['snippet']['title'],
-                                'url': f"https://www.youtube.com/watch?v={item['id']['videoId']}",
-                                'snippet': item['snippet']['description'],
-                                'source': 'youtube',
-                                'published_at': item['snippet']['publishedAt']
-                            })
-                        return {
-                            'success': True,
-                            'provider': 'YOUTUBE',
-                            'platform': 'youtube',
-                            'results': results
-                        }
+            await self._throttle('YOUTUBE')
+
+            params = {**self._request_tpls['YOUTUBE'], 'q': query, 'key': api_key}
+
+            # Caminho HTTP/2 multiplexado quando httpx[http2] está disponível
+            http2_client = self._get_http2_client()
+            if http2_client is not None:
+                response = await http2_client.get(self.service_urls['YOUTUBE'], params=params)
+                self.report_key_result('YOUTUBE', api_key, response.status_code)
+                if response.status_code == 200:
+                    data = _json_loads(response.content)
+                    results = [self._project_youtube_item(item) for item in data.get('items', [])]
+                    return {
+                        'success': True,
+                        'provider': 'YOUTUBE',
+                        'platform': 'youtube',
+                        'results': results
+                    }
+                logger.error(f"❌ YouTube API erro {response.status_code}: {response.text}")
+                return {'success': False, 'error': f'HTTP {response.status_code}'}
+
+            session = await self._get_session()
+            async with session.get(self.service_urls['YOUTUBE'], params=params, timeout=30) as response:
+                self.report_key_result('YOUTUBE', api_key, response.status)
+                if response.status == 200:
+                    results = []
+                    if self._should_stream_json(response):
+                        async for item in ijson.items_async(response.content, 'items.item'):
+                            results.append(self._project_youtube_item(item))
                     else:
-                        error_text = await response.text()
-                        logger.error(f"❌ YouTube API erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+                        data = _json_loads(await response.read())
+                        for item in data.get('items', []):
+                            results.append(self._project_youtube_item(item))
+                    return {
+                        'success': True,
+                        'provider': 'YOUTUBE',
+                        'platform': 'youtube',
+                        'results': results
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ YouTube API erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
         except Exception as e:
             logger.error(f"❌ Erro YouTube API: {e}")
             return {'success': False, 'error': str(e)}
@@ -587,110 +1202,193 @@ class RealSearchOrchestrator:
             if not api_key:
                 return {'success': False, 'error': 'Supadata API key não disponível'}
 
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {api_key}',
-                    'Content-Type': 'application/json'
-                }
-                payload = {
-                    'query': query,
-                    'platforms': ['instagram', 'facebook', 'tiktok'], # Exemplo de plataformas
-                    'num_results': 10
-                }
-                async with session.post(self.service_urls['SUPADATA'], headers=headers, json=payload, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        for platform, posts in data.get('results', {}).items():
-                            for post in posts:
-                                results.append({
-                                    'title': post.get('title', ''),
-                                    'url': post.get('url', ''),
-                                    'snippet': post.get('text', ''),
-                                    'source': 'supadata',
-                                    'platform': platform,
-                                    'likes': post.get('likes', 0),
-                                    'comments': post.get('comments', 0),
-                                    'shares': post.get('shares', 0),
-                                    'published_at': post.get('published_at')
-                                })
-                        return {
-                            'success': True,
-                            'provider': 'SUPADATA',
-                            'results': results
-                        }
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"❌ Supadata API erro {response.status}: {error_text}")
-                        return {'success': False, 'error': f'HTTP {response.status}'}
+            await self._throttle('SUPADATA')
+
+            session = await self._get_session()
+            headers = {
+                'Authorization': f'Bearer {api_key}',
+                'Content-Type': 'application/json'
+            }
+            payload = {**self._request_tpls['SUPADATA'], 'query': query}
+            async with session.post(self.service_urls['SUPADATA'], headers=headers, json=payload, timeout=60) as response:
+                self.report_key_result('SUPADATA', api_key, response.status)
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    results = []
+                    for platform, posts in data.get('results', {}).items():
+                        for post in posts:
+                            results.append(SearchResult(
+                                title=post.get('title', ''),
+                                url=post.get('url', ''),
+                                snippet=post.get('text', ''),
+                                source='supadata',
+                                platform=platform,
+                                likes=post.get('likes', 0),
+                                comments=post.get('comments', 0),
+                                shares=post.get('shares', 0),
+                                published_at=post.get('published_at') or ''
+                            ))
+                    return {
+                        'success': True,
+                        'provider': 'SUPADATA',
+                        'results': results
+                    }
+                else:
+                    error_text = await response.text()
+                    logger.error(f"❌ Supadata API erro {response.status}: {error_text}")
+                    return {'success': False, 'error': f'HTTP {response.status}'}
         except Exception as e:
             logger.error(f"❌ Erro Supadata API: {e}")
             return {'success': False, 'error': str(e)}
 
-    def _identify_viral_content(self, social_media_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _identify_viral_content(self, social_media_results: List[SearchResult]) -> List[SearchResult]:
         """Identifica conteúdo potencialmente viral com base em métricas de engajamento."""
         viral_threshold_likes = 1000  # Exemplo: mais de 1000 likes
         viral_threshold_comments = 100 # Exemplo: mais de 100 comentários
         viral_threshold_shares = 50   # Exemplo: mais de 50 compartilhamentos
 
-        viral_content = []
-        for item in social_media_results:
-            likes = item.get('likes', 0)
-            comments = item.get('comments', 0)
-            shares = item.get('shares', 0)
-
-            if (likes >= viral_threshold_likes or
-                comments >= viral_threshold_comments or
-                shares >= viral_threshold_shares):
-                viral_content.append(item)
-        
+        # Para corpora grandes, as três comparações são vetorizadas com NumPy
+        # sobre um array estruturado contíguo; abaixo de 1000 itens o custo de
+        # montar o array não se paga
+        if HAS_NUMPY and len(social_media_results) >= 1000:
+            metrics = np.fromiter(
+                (
+                    (item.likes, item.comments, item.shares)
+                    for item in social_media_results
+                ),
+                dtype=np.dtype([('likes', 'i4'), ('comments', 'i4'), ('shares', 'i4')]),
+                count=len(social_media_results)
+            )
+            mask = (
+                (metrics['likes'] >= viral_threshold_likes) |
+                (metrics['comments'] >= viral_threshold_comments) |
+                (metrics['shares'] >= viral_threshold_shares)
+            )
+            viral_content = [social_media_results[i] for i in np.nonzero(mask)[0]]
+        else:
+            viral_content = []
+            for item in social_media_results:
+                likes = item.likes
+                comments = item.comments
+                shares = item.shares
+
+                if (likes >= viral_threshold_likes or
+                    comments >= viral_threshold_comments or
+                    shares >= viral_threshold_shares):
+                    viral_content.append(item)
+
         logger.info(f"🔥 Identificados {len(viral_content)} itens de conteúdo potencialmente viral.")
         return viral_content
 
-    async def _capture_viral_screenshots(self, viral_content: List[Dict[str, Any]], session_id: str) -> List[str]:
-        """Captura screenshots de URLs de conteúdo viral."""
+    async def _capture_viral_screenshots(self, viral_content: List[SearchResult], session_id: str) -> List[str]:
+        """Captura screenshots de URLs de conteúdo viral com o pool de drivers."""
         from services.visual_content_capture import visual_content_capture
-        
-        captured_screenshots = []
-        for item in viral_content:
-            url = item.get('url')
-            if url:
-                try:
-                    screenshot_path = await visual_content_capture.capture_screenshot_async(url, session_id)
-                    if screenshot_path:
-                        captured_screenshots.append(screenshot_path)
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao capturar screenshot para {url}: {e}")
-        
+
+        urls = [item.url for item in viral_content if item.url]
+        if not urls:
+            return []
+
+        # O pool do capture_many limita quantos Chromes vivem ao mesmo tempo:
+        # mantém paralelismo sem estourar a memória do browser headless quando
+        # há dezenas de URLs virais
+        try:
+            capture_summary = await visual_content_capture.capture_screenshots(
+                urls, session_id, concurrency=_SCREENSHOT_WAVE_SIZE
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Erro na captura de screenshots virais: {e}")
+            return []
+
+        captured_screenshots = capture_summary.get("successful_captures_paths", [])
         logger.info(f"📸 Capturados {len(captured_screenshots)} screenshots de conteúdo viral.")
         return captured_screenshots
 
-    def _extract_search_results_from_content(self, content: str, source: str) -> List[Dict[str, Any]]:
-        """Extrai títulos, URLs e snippets de conteúdo textual (ex: de Firecrawl ou Jina)."""
+    def _extract_search_results_from_content(self, content: str, source: str) -> List[SearchResult]:
+        """Extrai títulos, URLs e snippets de conteúdo textual (ex: de Firecrawl ou Jina).
+
+        Com Hyperscan instalado, os dois padrões são avaliados em uma única
+        passada por um DFA em C; sem ele, cai no caminho `re` pré-compilado.
+        """
+        # Limita o conteúdo varrido para manter o custo de extração previsível
+        if len(content) > _MAX_EXTRACT_CONTENT_LEN:
+            content = content[:_MAX_EXTRACT_CONTENT_LEN]
+
+        if HAS_HYPERSCAN:
+            try:
+                return self._extract_with_hyperscan(content, source)
+            except Exception as e:
+                logger.debug(f"⚠️ Hyperscan falhou na extração ({e}), usando re")
+
+        return self._extract_with_re(content, source)
+
+    def _extract_with_hyperscan(self, content: str, source: str) -> List[SearchResult]:
+        """Varre o conteúdo em uma única passada com o DFA multi-padrão."""
+        data = content.encode('utf-8', errors='ignore')
+
+        # Hyperscan reporta um evento por extensão possível de cada padrão;
+        # mantém apenas o match mais longo por offset inicial
+        link_spans: Dict[int, int] = {}
+        url_spans: Dict[int, int] = {}
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context=None):
+            spans = link_spans if pattern_id == _HS_MD_LINK_ID else url_spans
+            if end > spans.get(start, 0):
+                spans[start] = end
+
+        _get_hyperscan_db().scan(data, match_event_handler=on_match)
+
         results = []
-        # Regex simplificado para encontrar URLs e títulos/snippets próximos
-        # Isso é um placeholder e pode precisar de refinamento dependendo do formato do conteúdo real
-        
-        # Exemplo: busca por links Markdown [title](url)
-        links = re.findall(r'\[(.*?)\]\((https?://[\w\d\./\-]+)\)', content)
+        for start in sorted(link_spans):
+            # Hyperscan não expõe grupos de captura; o padrão `re` equivalente
+            # reparte título/URL apenas no trecho já localizado
+            piece = data[start:link_spans[start]].decode('utf-8', errors='ignore')
+            match = _MD_LINK_RE.match(piece)
+            if match:
+                results.append(SearchResult(
+                    title=match.group(1),
+                    url=match.group(2),
+                    snippet='',
+                    source=source
+                ))
+
+        if not results:
+            snippet = content[:200] + "..." if len(content) > 200 else content
+            for start in sorted(url_spans):
+                url = data[start:url_spans[start]].decode('utf-8', errors='ignore')
+                results.append(SearchResult(
+                    title=f"Conteúdo de {url}",
+                    url=url,
+                    snippet=snippet,
+                    source=source
+                ))
+
+        return results
+
+    def _extract_with_re(self, content: str, source: str) -> List[SearchResult]:
+        """Extração com os padrões `re` pré-compilados (fallback sem Hyperscan)."""
+        results = []
+
+        # Busca por links Markdown [title](url) com padrão pré-compilado
+        links = _MD_LINK_RE.findall(content)
         for title, url in links:
-            results.append({
-                'title': title,
-                'url': url,
-                'snippet': '', # Snippet pode ser mais difícil de extrair com regex simples
-                'source': source
-            })
+            results.append(SearchResult(
+                title=title,
+                url=url,
+                snippet='', # Snippet pode ser mais difícil de extrair com regex simples
+                source=source
+            ))
 
         # Fallback: busca por URLs simples
         if not results:
-            urls = re.findall(r'https?://[\w\d\./\-]+', content)
+            urls = _BARE_URL_RE.findall(content)
+            snippet = content[:200] + "..." if len(content) > 200 else content
             for url in urls:
-                results.append({
-                    'title': f"Conteúdo de {url}",
-                    'url': url,
-                    'snippet': content[:200] + "..." if len(content) > 200 else content,
-                    'source': source
-                })
+                results.append(SearchResult(
+                    title=f"Conteúdo de {url}",
+                    url=url,
+                    snippet=snippet,
+                    source=source
+                ))
 
         return results
 
@@ -6,8 +6,12 @@ Extrator robusto para redes sociais
 """
 
 import logging
+import asyncio
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from copy import deepcopy
+from collections import Counter, OrderedDict
 
 from services.tavily_mcp_client import tavily_mcp_client
 from services.firecrawl_social_client import firecrawl_social_client
@@ -15,6 +19,11 @@ from services.predictive_analytics_service import predictive_analytics_service #
 
 logger = logging.getLogger(__name__)
 
+# Teto de caracteres alimentados ao scorer de sentimento por análise:
+# o custo de pontuação é ~linear no tamanho do texto, então corpora
+# gigantes são truncados em vez de estourar memória e tempo de análise
+_MAX_SENTIMENT_CHARS = 200_000
+
 class SocialMediaExtractor:
     """Extrator para análise de redes sociais"""
 
@@ -23,16 +32,36 @@ class SocialMediaExtractor:
         self.enabled = True
         self.tavily_client = tavily_mcp_client
         self.firecrawl_client = firecrawl_social_client
+
+        # Cache TTL por query: a mesma busca reemitida dentro da janela
+        # (retries de sessão, analisadores paralelos) retorna sem tocar nas
+        # APIs rate-limited; OrderedDict dá despejo LRU barato
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_ttl_s = 300
+        self._cache_max_entries = 64
+
         logger.info("✅ Social Media Extractor inicializado")
 
+    def close(self):
+        """Fecha as sessões HTTP persistentes dos clientes subjacentes"""
+        for client in (self.tavily_client, self.firecrawl_client):
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao fechar cliente HTTP: {e}")
+
     async def extract_comprehensive_data(self, query: str, context: Dict[str, Any], session_id: str) -> Dict[str, Any]:
         """Extrai dados abrangentes de redes sociais"""
         logger.info(f"🔍 Extraindo dados abrangentes para: {query}")
         
+        # Timestamp único por extração: evita recriar datetime + isoformat
+        # em cada dict montado ao longo da mesma operação lógica
+        timestamp = datetime.now().isoformat()
+
         try:
-            all_platforms_data = await self.search_all_platforms(query)
-            sentiment_analysis = await self.analyze_sentiment_trends(all_platforms_data) # Chamada assíncrona
-            
+            all_platforms_data = await self.search_all_platforms(query, timestamp=timestamp)
+            sentiment_analysis = await self.analyze_sentiment_trends(all_platforms_data, timestamp=timestamp)
+
             return {
                 "success": True,
                 "query": query,
@@ -41,7 +70,7 @@ class SocialMediaExtractor:
                 "sentiment_analysis": sentiment_analysis,
                 "total_posts": all_platforms_data.get("total_results", 0),
                 "platforms_analyzed": len(all_platforms_data.get("platforms", [])),
-                "extracted_at": datetime.now().isoformat()
+                "extracted_at": timestamp
             }
             
         except Exception as e:
@@ -53,42 +82,62 @@ class SocialMediaExtractor:
                 "session_id": session_id
             }
 
-    async def search_all_platforms(self, query: str) -> Dict[str, Any]:
+    async def search_all_platforms(self, query: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Busca em todas as plataformas de redes sociais usando Tavily e Firecrawl"""
 
         logger.info(f"🔍 Iniciando busca em redes sociais para: {query}")
 
+        now = time.monotonic()
+        hit = self._cache.get(query)
+        if hit and now - hit[0] < self._cache_ttl_s:
+            logger.info(f"⚡ Cache hit para busca social: {query[:50]}")
+            self._cache.move_to_end(query)
+            # Cópia profunda: o chamador pode mutar o resultado sem poluir o cache
+            return deepcopy(hit[1])
+
         results = {
             "query": query,
             "platforms": {},
             "total_results": 0,
             "search_quality": "real_data",
-            "generated_at": datetime.now().isoformat()
+            "generated_at": timestamp or datetime.now().isoformat()
         }
 
+        tasks = []
+        labels = []
+
         # Tenta usar Tavily para YouTube e Twitter
         if self.tavily_client.is_available():
-            youtube_data = await self.tavily_client.search_youtube_content(query)
-            if youtube_data.get("total_results", 0) > 0:
-                results["platforms"]["youtube"] = youtube_data
-                results["total_results"] += youtube_data["total_results"]
-            
-            twitter_data = await self.tavily_client.search_social_media(query, platforms=["twitter"])
-            if twitter_data.get("results", {}).get("twitter", {}).get("total_results", 0) > 0:
-                results["platforms"]["twitter"] = twitter_data["results"]["twitter"]
-                results["total_results"] += twitter_data["results"]["twitter"]["total_results"]
+            labels.append("youtube")
+            tasks.append(asyncio.to_thread(self.tavily_client.search_youtube_content, query))
+            labels.append("twitter")
+            tasks.append(asyncio.to_thread(self.tavily_client.search_social_media, query, ["twitter"]))
 
         # Tenta usar Firecrawl para Instagram e Facebook
         if self.firecrawl_client.is_available():
-            instagram_data = await self.firecrawl_client.search_social_media(query, platforms=["instagram"])
-            if instagram_data.get("results", {}).get("instagram", {}).get("total_results", 0) > 0:
-                results["platforms"]["instagram"] = instagram_data["results"]["instagram"]
-                results["total_results"] += instagram_data["results"]["instagram"]["total_results"]
+            labels.append("instagram")
+            tasks.append(asyncio.to_thread(self.firecrawl_client.search_social_media, query, ["instagram"]))
+            labels.append("facebook")
+            tasks.append(asyncio.to_thread(self.firecrawl_client.search_social_media, query, ["facebook"]))
+
+        # Dispara as buscas em paralelo (os clientes são síncronos, então cada
+        # uma roda em thread própria): o tempo de parede da fase vira o da
+        # requisição mais lenta em vez da soma das quatro
+        results_list = await asyncio.gather(*tasks, return_exceptions=True) if tasks else []
+
+        for label, data in zip(labels, results_list):
+            if isinstance(data, Exception):
+                logger.warning(f"⚠️ Busca em {label} falhou: {data}")
+                continue
 
-            facebook_data = await self.firecrawl_client.search_social_media(query, platforms=["facebook"])
-            if facebook_data.get("results", {}).get("facebook", {}).get("total_results", 0) > 0:
-                results["platforms"]["facebook"] = facebook_data["results"]["facebook"]
-                results["total_results"] += facebook_data["results"]["facebook"]["total_results"]
+            if label == "youtube":
+                platform_data = data
+            else:
+                platform_data = data.get("results", {}).get(label, {})
+
+            if platform_data.get("total_results", 0) > 0:
+                results["platforms"][label] = platform_data
+                results["total_results"] += platform_data["total_results"]
 
         if results["total_results"] == 0:
             logger.warning("Nenhuma API de rede social disponível ou retornou dados para a consulta.")
@@ -98,27 +147,59 @@ class SocialMediaExtractor:
 
         logger.info(f"✅ Busca concluída: {results['total_results']} posts encontrados")
 
+        # Só cacheia resultados bem-sucedidos e não vazios: uma falha
+        # transitória de API não pode envenenar os retries da mesma query
+        # durante a janela do TTL
+        if results["success"]:
+            self._cache[query] = (now, deepcopy(results))
+            self._cache.move_to_end(query)
+            while len(self._cache) > self._cache_max_entries:
+                self._cache.popitem(last=False)
+
         return results
 
-    async def analyze_sentiment_trends(self, platforms_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_sentiment_trends(self, platforms_data: Dict[str, Any], timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Analisa tendências de sentimento across platforms usando PredictiveAnalyticsService."""
 
-        all_text_content = []
-        platform_sentiments = {}
+        timestamp = timestamp or datetime.now().isoformat()
+
+        platform_text_map: Dict[str, List[str]] = {}
+        running_len = 0
 
         for platform_name, platform_info in platforms_data.get("platforms", {}).items():
+            if running_len >= _MAX_SENTIMENT_CHARS:
+                break
+
             if isinstance(platform_info, dict) and "results" in platform_info:
                 platform_texts = []
                 for item in platform_info["results"]:
-                    if "content" in item: 
-                        platform_texts.append(item["content"])
-                    elif "text" in item: 
-                        platform_texts.append(item["text"])
-                    elif "title" in item and "description" in item: 
-                        platform_texts.append(f"{item['title']} {item['description']}")
+                    if running_len >= _MAX_SENTIMENT_CHARS:
+                        logger.warning(
+                            f"⚠️ Corpus de sentimento truncado em {_MAX_SENTIMENT_CHARS} caracteres"
+                        )
+                        break
+
+                    if "content" in item:
+                        text = item["content"]
+                    elif "text" in item:
+                        text = item["text"]
+                    elif "title" in item and "description" in item:
+                        text = f"{item['title']} {item['description']}"
+                    else:
+                        continue
+
+                    # Aplica o teto de forma incremental, truncando o texto
+                    # que estoura o orçamento restante
+                    remaining = _MAX_SENTIMENT_CHARS - running_len
+                    if len(text) > remaining:
+                        text = text[:remaining]
+                    platform_texts.append(text)
+                    running_len += len(text)
 
                 if platform_texts:
-                    all_text_content.extend(platform_texts)
+                    platform_text_map[platform_name] = platform_texts
+
+        all_text_content = [text for texts in platform_text_map.values() for text in texts]
 
         if not all_text_content:
             logger.warning("⚠️ Nenhum conteúdo textual encontrado para análise de sentimento.")
@@ -130,20 +211,76 @@ class SocialMediaExtractor:
                 "total_posts_analyzed": 0,
                 "platform_breakdown": {},
                 "confidence_score": 0,
-                "analysis_timestamp": datetime.now().isoformat()
+                "analysis_timestamp": timestamp
             }
 
-        combined_text = " ".join(all_text_content)
-        sentiment_insights = await predictive_analytics_service.analyze_content_chunk(combined_text)
+        # Corpus minúsculo (ex: um único tweet curto): pontua inline com o
+        # VADER puro em vez de pagar o caminho completo do serviço preditivo
+        total_len = sum(map(len, all_text_content))
+        if total_len < 50:
+            try:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                tiny_scores = SentimentIntensityAnalyzer().polarity_scores(" ".join(all_text_content))
+            except ImportError:
+                tiny_scores = {}
 
-        overall_sentiment_data = sentiment_insights.get("sentiment_analysis", {})
-        
-        total_posts_analyzed = len(all_text_content) 
+            tiny_compound = tiny_scores.get("compound", 0.0)
+            tiny_label = "neutral"
+            if tiny_compound >= 0.05:
+                tiny_label = "positive"
+            elif tiny_compound <= -0.05:
+                tiny_label = "negative"
+
+            return {
+                "overall_sentiment": tiny_label,
+                "overall_positive_percentage": round(tiny_scores.get("pos", 0.0) * 100, 1),
+                "overall_negative_percentage": round(tiny_scores.get("neg", 0.0) * 100, 1),
+                "overall_neutral_percentage": round(tiny_scores.get("neu", 0.0) * 100, 1),
+                "total_posts_analyzed": len(all_text_content),
+                "platform_breakdown": {},
+                "confidence_score": round(abs(tiny_scores.get("pos", 0.0) - tiny_scores.get("neg", 0.0)) * 100, 1),
+                "analysis_timestamp": timestamp
+            }
+
+        # Deduplica antes de pontuar: corpora sociais têm 20-60% de retweets/
+        # reposts idênticos. Cada texto único é pontuado uma única vez e o
+        # peso de multiplicidade é reaplicado na agregação, de modo que as
+        # médias continuam refletindo posts e não textos únicos
+        counts = Counter(all_text_content)
+        unique_texts = list(counts.keys())
+        scores = await predictive_analytics_service.analyze_batch(unique_texts)
+        score_by_text = dict(zip(unique_texts, scores))
+
+        total_posts_analyzed = len(all_text_content)
+
+        platform_sentiments = {}
+        for platform_name, platform_texts in platform_text_map.items():
+            count = len(platform_texts)
+            pos = sum(score_by_text[text].get("pos", 0.0) for text in platform_texts) / count
+            neg = sum(score_by_text[text].get("neg", 0.0) for text in platform_texts) / count
+            neu = sum(score_by_text[text].get("neu", 0.0) for text in platform_texts) / count
+            compound = sum(score_by_text[text].get("compound", 0.0) for text in platform_texts) / count
+
+            platform_sentiments[platform_name] = {
+                "positive_percentage": round(pos * 100, 1),
+                "negative_percentage": round(neg * 100, 1),
+                "neutral_percentage": round(neu * 100, 1),
+                "compound": round(compound, 3),
+                "posts_analyzed": count
+            }
 
-        overall_positive = overall_sentiment_data.get("pos", 0.0)
-        overall_negative = overall_sentiment_data.get("neg", 0.0)
-        overall_neutral = overall_sentiment_data.get("neu", 0.0)
-        overall_compound = overall_sentiment_data.get("compound", 0.0)
+        overall_positive = sum(
+            score.get("pos", 0.0) * counts[text] for text, score in score_by_text.items()
+        ) / total_posts_analyzed
+        overall_negative = sum(
+            score.get("neg", 0.0) * counts[text] for text, score in score_by_text.items()
+        ) / total_posts_analyzed
+        overall_neutral = sum(
+            score.get("neu", 0.0) * counts[text] for text, score in score_by_text.items()
+        ) / total_posts_analyzed
+        overall_compound = sum(
+            score.get("compound", 0.0) * counts[text] for text, score in score_by_text.items()
+        ) / total_posts_analyzed
 
         overall_sentiment_label = "neutral"
         if overall_compound >= 0.05:
@@ -159,7 +296,7 @@ class SocialMediaExtractor:
             "total_posts_analyzed": total_posts_analyzed,
             "platform_breakdown": platform_sentiments, 
             "confidence_score": round(abs(overall_positive - overall_negative) * 100, 1) if total_posts_analyzed > 0 else 0,
-            "analysis_timestamp": datetime.now().isoformat()
+            "analysis_timestamp": timestamp
         }
 
 # Instância global
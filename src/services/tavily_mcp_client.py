@@ -28,8 +28,27 @@ class TavilyMCPClient:
             self.enabled = False
         else:
             self.enabled = True
-        
+
+        # Cliente HTTP persistente com keep-alive: amortiza o handshake
+        # TCP+TLS (~100-300ms) entre chamadas sucessivas à API
+        self._client: Optional[httpx.Client] = None
+
         logger.info("🔍 Tavily MCP Client inicializado")
+
+    def _get_client(self) -> httpx.Client:
+        """Retorna o cliente HTTP persistente, criando-o na primeira chamada"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._client
+
+    def close(self):
+        """Fecha o cliente HTTP persistente (chamar no shutdown da aplicação)"""
+        if self._client is not None and not self._client.is_closed:
+            self._client.close()
+        self._client = None
     
     def search_social_media(self, query: str, platforms: List[str] = None) -> Dict[str, Any]:
         """Busca nas redes sociais via Tavily"""
@@ -156,14 +175,13 @@ class TavilyMCPClient:
                 "include_domains": self._get_context_domains(context)
             }
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(self.base_url, headers=headers, json=payload)
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.error(f"❌ Tavily API erro {response.status_code}: {response.text}")
-                    response.raise_for_status() # Levanta exceção para erros HTTP
+            response = self._get_client().post(self.base_url, headers=headers, json=payload)
+
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"❌ Tavily API erro {response.status_code}: {response.text}")
+                response.raise_for_status() # Levanta exceção para erros HTTP
                     
         except Exception as e:
             logger.error(f"❌ Erro na execução Tavily: {e}")